@@ -9,19 +9,365 @@ Supports adding, updating, or removing XML attributes with automatic backup/rest
 import os
 import sys
 import argparse
+import multiprocessing
+import re
 import tempfile
 import shutil
 import zipfile
 import subprocess
+import threading
 import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, NamedTuple, Tuple, Optional
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed for --optimize-pages
+    Image = None
+
+
+# Free space always left untouched on a filesystem, so a run never fills it completely
+TEMP_SPACE_RESERVE = 64 * 1024 * 1024
+
+# Rough working-set of the archiver used to repack (zlib buffers, rar dictionary)
+CBZ_ARCHIVER_MEMORY = 32 * 1024 * 1024
+CBR_ARCHIVER_MEMORY = 256 * 1024 * 1024
+
+# ElementTree needs many times the file size to hold a parsed ComicInfo.xml
+XML_MEMORY_FACTOR = 20
+
+# Buffer size used when streaming archive members in low-space mode
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# A decoded page needs many times its compressed size (pixel buffer plus resized copy)
+IMAGE_MEMORY_FACTOR = 20
+
+# Target formats for --optimize-pages: name -> (Pillow format, file extension)
+PAGE_FORMATS = {
+    'jpeg': ('JPEG', '.jpg'),
+    'webp': ('WEBP', '.webp'),
+    'png': ('PNG', '.png'),
+}
+
+
+def parse_size(size_str: str) -> int:
+    """
+    Parse a human-readable size such as "512M" or "4G" into bytes.
+
+    Units are binary (K = 1024) and an optional trailing "B" or "iB" is accepted.
+    """
+    units = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+    value = size_str.strip().upper()
+    for suffix in ('IB', 'B'):
+        if value.endswith(suffix) and len(value) > len(suffix):
+            value = value[:-len(suffix)]
+            break
+
+    unit = value[-1:] if value[-1:] in units else ''
+    number = value[:-1] if unit else value
+
+    try:
+        size = int(float(number) * units[unit])
+    except (ValueError, OverflowError):
+        raise argparse.ArgumentTypeError(f"invalid size: {size_str}")
+
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"size must be positive: {size_str}")
+    return size
+
+
+def format_size(size: int) -> str:
+    """Format a byte count for display."""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def optimize_page(page_path: str, page_format: str, quality: int,
+                  max_dimension: int) -> Optional[Tuple[str, str, int, int, int, int]]:
+    """
+    Re-encode and/or downscale a single page image. Runs in a worker process.
+
+    Pages that are already in the target format and within max_dimension are
+    skipped. The original is kept whenever the re-encoded page isn't smaller.
+
+    Args:
+        page_path: Path to the page image
+        page_format: Key of PAGE_FORMATS, or 'original' to keep the page's own format
+        quality: Encoder quality (JPEG/WEBP)
+        max_dimension: Maximum width/height in pixels (0 = no limit)
+
+    Returns:
+        Tuple of (original path, new path, original size, new size, width, height),
+        or None if the page was left as it is
+    """
+    path = Path(page_path)
+    original_size = path.stat().st_size
+
+    with Image.open(path) as img:
+        # Animated pages can't be re-encoded without losing frames
+        if getattr(img, 'n_frames', 1) > 1:
+            return None
+
+        if page_format == 'original':
+            target = next((name for name, (pil_format, _) in PAGE_FORMATS.items()
+                           if pil_format == img.format), None)
+            if target is None:
+                return None
+        else:
+            target = page_format
+
+        pil_format, extension = PAGE_FORMATS[target]
+        oversized = max_dimension > 0 and max(img.size) > max_dimension
+
+        if not oversized and img.format == pil_format:
+            return None
+
+        new_path = path if img.format == pil_format else path.with_suffix(extension)
+        if new_path != path:
+            # Claim the new name atomically: another page (cover.png and cover.gif -> cover.webp)
+            # may be converting to the same name in a different worker
+            try:
+                os.close(os.open(new_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                return None
+
+        encoded_path = path.with_name(f".{path.name}.optimized")
+        replaced = False
+        try:
+            save_options = {}
+            if img.info.get('icc_profile'):
+                save_options['icc_profile'] = img.info['icc_profile']
+
+            if oversized:
+                # Pillow falls back to nearest-neighbour for palette and 1-bit images, which
+                # makes line art jagged, so resample those in a full-colour/greyscale mode
+                if img.mode == '1':
+                    img = img.convert('L')
+                elif img.mode == 'P':
+                    img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+                img.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+            if pil_format == 'JPEG':
+                if img.mode not in ('RGB', 'L', 'CMYK'):
+                    img = img.convert('RGB')
+                save_options.update(quality=quality, optimize=True, progressive=True)
+            elif pil_format == 'WEBP':
+                if img.mode not in ('RGB', 'RGBA'):
+                    img = img.convert('RGBA' if 'transparency' in img.info or img.mode in ('LA', 'PA') else 'RGB')
+                save_options.update(quality=quality, method=6)
+            else:  # PNG
+                save_options.update(optimize=True)
+
+            img.save(encoded_path, pil_format, **save_options)
+            width, height = img.size
+
+            new_size = encoded_path.stat().st_size
+            if new_size >= original_size:
+                return None
+
+            os.replace(encoded_path, new_path)
+            replaced = True
+            if new_path != path:
+                path.unlink()
+        finally:
+            if encoded_path.exists():
+                encoded_path.unlink()
+            if not replaced and new_path != path and new_path.exists():
+                new_path.unlink()
+
+    return str(path), str(new_path), original_size, new_size, width, height
+
+
+def page_sort_key(name: str) -> List:
+    """Natural sort key, so page2 comes before page10 as in comic readers."""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+
+class ResourceEstimate(NamedTuple):
+    """
+    Peak temp-space and memory needed to process one archive.
+
+    Page optimization memory is kept separate, since it is spent in the page
+    pool shared by all files: page_bytes is the memory to decode one page and
+    page_slots how many of the file's pages the pool can decode at once.
+    """
+    temp_bytes: int
+    memory_bytes: int
+    page_bytes: int = 0
+    page_slots: int = 0
+
+
+class Reservation(NamedTuple):
+    """Resources held by a file while it is being processed."""
+    mode: str
+    estimate: ResourceEstimate
+    device: int
+
+
+class ResourceScheduler:
+    """
+    Admit comic files for processing only while they fit the resource budgets.
+
+    Each archive has two estimates: the normal extract/repack path, which needs
+    space for the backup, the extracted tree and the new archive in the work
+    directory, and the low-space streaming path, which only needs room for one
+    rewritten copy next to the original. Files run on the normal path when it
+    fits, fall back to streaming when it does not, and are rejected when neither
+    fits. While other files are running, a file waits until enough of the
+    budget has been released.
+
+    Disk space is reserved per filesystem, so normal-path files are charged to
+    the work directory's filesystem (and --max-temp) and streaming files to the
+    filesystem holding the comic.
+    """
+
+    def __init__(self, work_dir: Path, max_temp: Optional[int] = None, max_memory: Optional[int] = None,
+                 page_workers: int = 1):
+        """
+        Initialize the scheduler.
+
+        Args:
+            work_dir: Directory used for backups and extraction
+            max_temp: Maximum temp space in bytes in the work directory for all running files
+                      (None = free space only)
+            max_memory: Maximum memory in bytes for all running files (None = unlimited)
+            page_workers: Number of workers in the shared page optimization pool
+        """
+        self.work_dir = work_dir
+        self.work_device = os.stat(work_dir).st_dev
+        self.max_temp = max_temp
+        self.max_memory = max_memory
+        self.page_workers = page_workers
+        self.temp_in_use = 0
+        self.memory_in_use = 0
+        self.active = 0
+
+        # (page_bytes, page_slots) of running files that use the page pool
+        self.page_reservations: List[Tuple[int, int]] = []
+
+        # Per filesystem (st_dev): bytes reserved, files holding a reservation, usable free space
+        self.disk_in_use: Dict[int, int] = {}
+        self.disk_active: Dict[int, int] = {}
+        self.disk_capacity: Dict[int, int] = {}
+
+        self._condition = threading.Condition()
+
+    def _capacity(self, device: int, path: Path) -> int:
+        """Usable space on a filesystem, re-read whenever nothing holds a reservation on it."""
+        if self.disk_active.get(device, 0) == 0:
+            free = shutil.disk_usage(path).free - TEMP_SPACE_RESERVE
+            self.disk_capacity[device] = max(free, 0)
+        return self.disk_capacity[device]
+
+    def _pool_memory(self, reservations: List[Tuple[int, int]]) -> int:
+        """
+        Peak memory of the shared page pool for the given files.
+
+        Each file can't have more pages decoding than its slots, and the pool as
+        a whole never decodes more pages than it has workers.
+        """
+        if not reservations:
+            return 0
+        per_file = sum(page_bytes * page_slots for page_bytes, page_slots in reservations)
+        whole_pool = self.page_workers * max(page_bytes for page_bytes, _ in reservations)
+        return min(per_file, whole_pool)
+
+    def _memory_needed(self, estimate: ResourceEstimate, running: bool) -> int:
+        """Memory in use once the file is admitted, alongside running files or on its own."""
+        reservations = list(self.page_reservations) if running else []
+        if estimate.page_slots:
+            reservations.append((estimate.page_bytes, estimate.page_slots))
+        base = self.memory_in_use if running else 0
+        return base + estimate.memory_bytes + self._pool_memory(reservations)
+
+    def _fits_memory(self, estimate: ResourceEstimate) -> bool:
+        return self.max_memory is None or self._memory_needed(estimate, running=False) <= self.max_memory
+
+    def choose_mode(self, comic_path: Path, full: ResourceEstimate,
+                    streaming: ResourceEstimate) -> Optional[str]:
+        """
+        Pick the processing path for a file.
+
+        Returns:
+            'full', 'streaming', or None if the file cannot fit either way
+        """
+        full_temp_fits = (full.temp_bytes <= self._capacity(self.work_device, self.work_dir) and
+                          (self.max_temp is None or full.temp_bytes <= self.max_temp))
+        if full_temp_fits and self._fits_memory(full):
+            return 'full'
+
+        comic_device = os.stat(comic_path.parent).st_dev
+        if (streaming.temp_bytes <= self._capacity(comic_device, comic_path.parent) and
+                self._fits_memory(streaming)):
+            return 'streaming'
+        return None
+
+    def acquire(self, comic_path: Path, full: ResourceEstimate,
+                streaming: ResourceEstimate) -> Optional[Reservation]:
+        """
+        Block until the file can be admitted, then reserve its share of the budget.
+
+        Returns:
+            The reservation to pass to release(), or None if the file can never fit
+        """
+        with self._condition:
+            while True:
+                mode = self.choose_mode(comic_path, full, streaming)
+                if mode is None:
+                    return None
+
+                if mode == 'full':
+                    estimate = full
+                    device = self.work_device
+                    temp_fits = self.max_temp is None or self.temp_in_use + estimate.temp_bytes <= self.max_temp
+                else:
+                    estimate = streaming
+                    device = os.stat(comic_path.parent).st_dev
+                    temp_fits = True
+
+                disk_fits = self.disk_in_use.get(device, 0) + estimate.temp_bytes <= self.disk_capacity[device]
+                memory_fits = (self.max_memory is None or
+                               self._memory_needed(estimate, running=True) <= self.max_memory)
+
+                # A file that fits the budget on its own is always admitted when nothing else runs
+                if self.active == 0 or (temp_fits and disk_fits and memory_fits):
+                    if mode == 'full':
+                        self.temp_in_use += estimate.temp_bytes
+                    self.disk_in_use[device] = self.disk_in_use.get(device, 0) + estimate.temp_bytes
+                    self.disk_active[device] = self.disk_active.get(device, 0) + 1
+                    self.memory_in_use += estimate.memory_bytes
+                    if estimate.page_slots:
+                        self.page_reservations.append((estimate.page_bytes, estimate.page_slots))
+                    self.active += 1
+                    return Reservation(mode, estimate, device)
+
+                self._condition.wait()
+
+    def release(self, reservation: Reservation):
+        """Return a finished file's share of the budget."""
+        with self._condition:
+            estimate = reservation.estimate
+            if reservation.mode == 'full':
+                self.temp_in_use -= estimate.temp_bytes
+            self.disk_in_use[reservation.device] -= estimate.temp_bytes
+            self.disk_active[reservation.device] -= 1
+            self.memory_in_use -= estimate.memory_bytes
+            if estimate.page_slots:
+                self.page_reservations.remove((estimate.page_bytes, estimate.page_slots))
+            self.active -= 1
+            self._condition.notify_all()
 
 
 class ComicInfoModifier:
     def __init__(self, attributes: List[Tuple[str, str]] = None, verbose: bool = False, update_only: bool = False,
-                 clean_archive: bool = False, recursive: bool = True):
+                 clean_archive: bool = False, recursive: bool = True, optimize_pages: bool = False,
+                 page_format: str = 'original', page_quality: int = 85, page_max_dimension: int = 3200):
         """
         Initialize the modifier.
 
@@ -31,18 +377,36 @@ class ComicInfoModifier:
             update_only: Only update existing attributes, don't create new ones
             clean_archive: Remove non-comic files when repackaging
             recursive: Process subdirectories recursively
+            optimize_pages: Re-encode/downscale page images when repackaging
+            page_format: Target page format (key of PAGE_FORMATS, or 'original')
+            page_quality: Encoder quality for optimized pages (JPEG/WEBP)
+            page_max_dimension: Maximum page width/height in pixels (0 = no limit)
         """
         self.attributes = attributes or []
         self.verbose = verbose
         self.update_only = update_only
         self.clean_archive = clean_archive
         self.recursive = recursive
+        self.optimize_pages = optimize_pages
+        self.page_format = page_format
+        self.page_quality = page_quality
+        self.page_max_dimension = page_max_dimension
         self.backup_dir = None
+        self._backup_lock = threading.Lock()
+        self.page_pool = None
+        self.page_workers = os.cpu_count() or 1
+        self._page_pool_lock = threading.Lock()
 
-        # Define allowed file extensions for clean archives
-        self.allowed_extensions = {
-            # Image files
+        # Bytes saved by page optimization: comic path -> (pages optimized, bytes saved)
+        self.page_savings: Dict[Path, Tuple[int, int]] = {}
+
+        # Page image extensions
+        self.image_extensions = {
             '.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tiff', '.tif',
+        }
+
+        # Define allowed file extensions for clean archives
+        self.allowed_extensions = self.image_extensions | {
             # Metadata files
             '.xml',  # ComicInfo.xml, etc.
         }
@@ -97,11 +461,19 @@ class ComicInfoModifier:
         Returns:
             Path to backup file
         """
-        if self.backup_dir is None:
-            self.backup_dir = Path(tempfile.mkdtemp(prefix='comic_backup_'))
-            self.log(f"Created backup directory: {self.backup_dir}")
+        with self._backup_lock:
+            if self.backup_dir is None:
+                self.backup_dir = Path(tempfile.mkdtemp(prefix='comic_backup_'))
+                self.log(f"Created backup directory: {self.backup_dir}")
+
+            # Files with the same name from different directories may be processed concurrently
+            backup_path = self.backup_dir / file_path.name
+            counter = 1
+            while backup_path.exists():
+                backup_path = self.backup_dir / f"{file_path.stem}_{counter}{file_path.suffix}"
+                counter += 1
+            backup_path.touch()
 
-        backup_path = self.backup_dir / file_path.name
         shutil.copy2(file_path, backup_path)
         self.log(f"Backed up: {file_path.name}")
         return backup_path
@@ -139,6 +511,231 @@ class ComicInfoModifier:
         # Check if extension is in allowed list
         return ext in self.allowed_extensions
 
+    def list_members(self, comic_path: Path) -> Optional[List[Tuple[str, int]]]:
+        """
+        Read the member table of an archive without extracting it.
+
+        Args:
+            comic_path: Path to the comic file
+
+        Returns:
+            List of (member_name, uncompressed_size) tuples for files, or None if unreadable
+        """
+        try:
+            if comic_path.suffix.lower() == '.cbz':
+                with zipfile.ZipFile(comic_path, 'r') as zip_ref:
+                    return [(info.filename, info.file_size)
+                            for info in zip_ref.infolist() if not info.is_dir()]
+
+            result = subprocess.run(
+                ['unrar', 'lt', str(comic_path)],
+                capture_output=True,
+                text=True,
+                check=False
+            )
+
+            if result.returncode != 0:
+                return None
+
+            # Technical listing has one "Name:", "Type:" and "Size:" line per entry
+            members = []
+            name = None
+            is_file = True
+            for line in result.stdout.splitlines():
+                key, _, value = line.strip().partition(': ')
+                if key == 'Name':
+                    name = value
+                    is_file = True
+                elif key == 'Type':
+                    is_file = value == 'File'
+                elif key == 'Size' and name is not None:
+                    if is_file:
+                        members.append((name, int(value)))
+                    name = None
+            return members
+        except Exception as e:
+            self.log(f"Could not read member table of {comic_path.name}: {e}", 'WARNING')
+            return None
+
+    def estimate_resources(self, comic_path: Path) -> Tuple[ResourceEstimate, ResourceEstimate]:
+        """
+        Estimate the peak temp space and memory needed to process an archive.
+
+        Args:
+            comic_path: Path to the comic file
+
+        Returns:
+            Tuple of (normal path estimate, low-space streaming path estimate)
+        """
+        archive_size = comic_path.stat().st_size
+        is_cbz = comic_path.suffix.lower() == '.cbz'
+        members = self.list_members(comic_path)
+
+        if members is None:
+            # Comic pages are already compressed, so the archive size is a fair guess
+            extracted_size = archive_size
+            kept_size = archive_size
+            xml_size = 0
+            largest_page = archive_size
+        else:
+            extracted_size = sum(size for _, size in members)
+            kept_size = sum(size for name, size in members if self.should_keep_file(Path(name)))
+            xml_size = sum(size for name, size in members if name == 'ComicInfo.xml')
+            largest_page = max((size for name, size in members
+                                if Path(name).suffix.lower() in self.image_extensions), default=0)
+
+        # Normal path: backup + extracted tree + new archive (+ a filtered copy for clean CBR)
+        full_temp = archive_size + extracted_size + kept_size
+        if self.clean_archive and not is_cbz:
+            full_temp += kept_size
+
+        archiver_memory = CBZ_ARCHIVER_MEMORY if is_cbz else CBR_ARCHIVER_MEMORY
+        xml_memory = xml_size * XML_MEMORY_FACTOR
+
+        # Pages are decoded in the shared page pool, which the scheduler charges for;
+        # every page decoding at once also writes its re-encoded copy beside it
+        page_bytes = 0
+        page_slots = 0
+        if self.optimize_pages:
+            page_count = (sum(1 for name, _ in members if Path(name).suffix.lower() in self.image_extensions)
+                          if members is not None else self.page_workers)
+            page_slots = min(self.page_workers, page_count)
+            page_bytes = largest_page * IMAGE_MEMORY_FACTOR
+            full_temp += largest_page * page_slots
+
+        full = ResourceEstimate(full_temp, archiver_memory + xml_memory, page_bytes, page_slots)
+        # Low-space CBR also needs room for the copy rar rebuilds while updating it
+        streaming_temp = kept_size if is_cbz else archive_size + kept_size
+        streaming = ResourceEstimate(streaming_temp, archiver_memory + xml_memory + STREAM_CHUNK_SIZE)
+        return full, streaming
+
+    def get_page_pool(self) -> ProcessPoolExecutor:
+        """Get the process pool used to encode pages, shared by all files in progress."""
+        with self._page_pool_lock:
+            if self.page_pool is None:
+                # Spawn rather than fork, since files may be processed on several threads
+                self.page_pool = ProcessPoolExecutor(max_workers=self.page_workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self.page_pool
+
+    def replace_page_pool(self, broken_pool: ProcessPoolExecutor):
+        """Discard a pool whose worker died, so the next file gets a fresh one."""
+        with self._page_pool_lock:
+            # Files sharing the pool all see it break; only the first one replaces it
+            if self.page_pool is broken_pool:
+                self.page_pool = None
+                broken_pool.shutdown(wait=False)
+
+    def optimize_page_images(self, source_dir: Path,
+                             comic_path: Path) -> Optional[List[Tuple[str, str, int, int, int, int]]]:
+        """
+        Re-encode/downscale every page image in an extracted archive.
+
+        Args:
+            source_dir: Directory holding the extracted archive
+            comic_path: Archive the pages came from (for logging and the report)
+
+        Returns:
+            List of optimize_page results for the pages that were replaced,
+            or None if a page worker died (e.g. killed for running out of memory)
+        """
+        pages = [Path(root) / file
+                 for root, dirs, files in os.walk(source_dir)
+                 for file in files
+                 if Path(file).suffix.lower() in self.image_extensions and self.should_keep_file(Path(file))]
+
+        pool = self.get_page_pool()
+        try:
+            futures = [pool.submit(optimize_page, str(page), self.page_format, self.page_quality,
+                                   self.page_max_dimension)
+                       for page in pages]
+        except BrokenProcessPool:
+            self.log(f"Page worker died while optimizing {comic_path.name}", 'ERROR')
+            self.replace_page_pool(pool)
+            return None
+
+        optimized = []
+        for page, future in zip(pages, futures):
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                self.log(f"Page worker died while optimizing {page.name} in {comic_path.name}", 'ERROR')
+                self.replace_page_pool(pool)
+                for pending in futures:
+                    pending.cancel()
+                return None
+            except Exception as e:
+                self.log(f"Could not optimize {page.name}, keeping original: {e}", 'WARNING')
+                continue
+
+            if result is not None:
+                optimized.append(result)
+                self.log(f"Optimized {page.name}: {format_size(result[2])} -> {format_size(result[3])}")
+
+        if optimized:
+            saved = sum(old_size - new_size for _, _, old_size, new_size, _, _ in optimized)
+            self.log(f"Optimized {len(optimized)} of {len(pages)} page(s) in {comic_path.name}, "
+                     f"saved {format_size(saved)}")
+
+        return optimized
+
+    def update_page_metadata(self, xml_path: Path, source_dir: Path,
+                             optimized: List[Tuple[str, str, int, int, int, int]]) -> bool:
+        """
+        Update <Pages> sizes in ComicInfo.xml to match optimized page images.
+
+        Page entries refer to images by index in reading order, so the extracted
+        images are sorted the same way a reader would to find each page's index.
+        The order comes from the original file names, since converting a page's
+        format renames it.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            tree = ET.parse(xml_path)
+            root = tree.getroot()
+
+            pages_element = root.find('Pages')
+            if pages_element is None:
+                return True
+
+            original_names = {str(Path(new_path).relative_to(source_dir)): str(Path(old_path).relative_to(source_dir))
+                              for old_path, new_path, _, _, _, _ in optimized}
+
+            images = sorted(
+                (original_names.get(name, name)
+                 for name in (str(Path(root_dir, file).relative_to(source_dir))
+                              for root_dir, dirs, files in os.walk(source_dir)
+                              for file in files
+                              if Path(file).suffix.lower() in self.image_extensions
+                              and self.should_keep_file(Path(file)))),
+                key=page_sort_key
+            )
+            page_index = {name: index for index, name in enumerate(images)}
+
+            entries = {page.get('Image'): page for page in pages_element.findall('Page')}
+
+            for old_path, _, _, new_size, width, height in optimized:
+                index = page_index.get(str(Path(old_path).relative_to(source_dir)))
+                page = entries.get(str(index))
+                if page is None:
+                    continue
+
+                page.set('ImageSize', str(new_size))
+                if page.get('ImageWidth') is not None or page.get('ImageHeight') is not None:
+                    page.set('ImageWidth', str(width))
+                    page.set('ImageHeight', str(height))
+
+            tree.write(xml_path, encoding='utf-8', xml_declaration=True)
+            return True
+        except ET.ParseError as e:
+            self.log(f"XML parsing error: {e}", 'ERROR')
+            return False
+        except Exception as e:
+            self.log(f"Error updating page metadata: {e}", 'ERROR')
+            return False
+
     def extract_cbz(self, cbz_path: Path, extract_dir: Path) -> bool:
         """Extract CBZ file."""
         try:
@@ -213,8 +810,6 @@ class ComicInfoModifier:
     def create_cbr(self, source_dir: Path, output_path: Path) -> bool:
         """Create CBR file from directory using rar."""
         try:
-            original_cwd = os.getcwd()
-
             # If clean_archive is enabled, copy only allowed files to temp dir
             if self.clean_archive:
                 with tempfile.TemporaryDirectory(prefix='cbr_clean_') as clean_dir:
@@ -239,32 +834,27 @@ class ComicInfoModifier:
                         self.log(f"Cleaned archive: removed {len(files_excluded)} non-comic file(s)")
 
                     # Create RAR from clean directory
-                    os.chdir(clean_path)
                     result = subprocess.run(
                         ['rar', 'a', '-r', '-ep1', str(output_path), '*'],
+                        cwd=clean_path,
                         capture_output=True,
                         text=True,
                         check=False
                     )
 
-                    os.chdir(original_cwd)
-
                     if result.returncode != 0:
                         self.log(f"rar error: {result.stderr}", 'ERROR')
                         return False
             else:
                 # Normal mode - include all files
-                os.chdir(source_dir)
-
                 result = subprocess.run(
                     ['rar', 'a', '-r', '-ep1', str(output_path), '*'],
+                    cwd=source_dir,
                     capture_output=True,
                     text=True,
                     check=False
                 )
 
-                os.chdir(original_cwd)
-
                 if result.returncode != 0:
                     self.log(f"rar error: {result.stderr}", 'ERROR')
                     return False
@@ -277,9 +867,6 @@ class ComicInfoModifier:
         except Exception as e:
             self.log(f"Failed to create CBR {output_path.name}: {e}", 'ERROR')
             return False
-        finally:
-            if os.getcwd() != original_cwd:
-                os.chdir(original_cwd)
 
     def modify_comic_info(self, xml_path: Path) -> Tuple[bool, bool]:
         """
@@ -385,6 +972,21 @@ class ComicInfoModifier:
                     self.restore_backup(backup_path, comic_path)
                     return False, False
 
+                optimized = []
+                if self.optimize_pages:
+                    optimized = self.optimize_page_images(temp_path, comic_path)
+
+                    if optimized is None:
+                        self.restore_backup(backup_path, comic_path)
+                        return False, False
+
+                    if optimized:
+                        if not self.update_page_metadata(comic_info_path, temp_path, optimized):
+                            self.restore_backup(backup_path, comic_path)
+                            return False, False
+
+                        modified = True
+
                 if not modified:
                     self.log(f"No changes needed for {comic_path.name}")
                     return True, False
@@ -405,6 +1007,9 @@ class ComicInfoModifier:
                 # Replace original file
                 try:
                     shutil.copy2(temp_output, comic_path)
+                    if optimized:
+                        saved = sum(old_size - new_size for _, _, old_size, new_size, _, _ in optimized)
+                        self.page_savings[comic_path] = (len(optimized), saved)
                     self.log(f"Successfully updated: {comic_path.name}")
                     return True, True
                 except Exception as e:
@@ -417,8 +1022,204 @@ class ComicInfoModifier:
             # If we succeeded, we don't need the backup anymore
             self.delete_backup(backup_path)
 
+    def copy_ownership(self, source: Path, dest: Path):
+        """Give a replacement file the original's owner and group, where permitted."""
+        if not hasattr(os, 'chown'):
+            return
+
+        stat = source.stat()
+        try:
+            os.chown(dest, stat.st_uid, stat.st_gid)
+        except PermissionError:
+            self.log(f"Could not keep owner/group of {source.name}", 'WARNING')
+
+    def process_file_streaming(self, comic_path: Path) -> Tuple[bool, bool]:
+        """
+        Process a single comic file in low-space mode.
+
+        Only ComicInfo.xml is extracted. The rest of the archive is rewritten
+        member by member next to the original, which is replaced only once the
+        new archive is complete, so no backup or extracted tree is needed.
+
+        Returns:
+            Tuple of (success, modified), as for process_file
+        """
+        self.log(f"\nProcessing (low-space mode): {comic_path}")
+
+        if self.optimize_pages:
+            # Page optimization needs the normal extract/repack path
+            if not self.attributes:
+                self.log(f"Not enough space or memory to optimize pages in {comic_path.name} "
+                         f"(page optimization needs the normal extract/repack path)", 'ERROR')
+                return False, False
+
+            self.log(f"Not enough space or memory to optimize pages in {comic_path.name}, "
+                     f"updating attributes only", 'WARNING')
+
+        is_cbz = comic_path.suffix.lower() == '.cbz'
+
+        with tempfile.TemporaryDirectory(prefix='comic_stream_') as temp_dir:
+            temp_path = Path(temp_dir)
+
+            if is_cbz:
+                return self._stream_cbz(comic_path, temp_path)
+            else:  # CBR
+                return self._stream_cbr(comic_path, temp_path)
+
+    def _stream_cbz(self, comic_path: Path, temp_path: Path) -> Tuple[bool, bool]:
+        """Rewrite a CBZ by copying members straight from the original archive."""
+        comic_info_path = temp_path / 'ComicInfo.xml'
+        partial_path = None
+
+        try:
+            with zipfile.ZipFile(comic_path, 'r') as src:
+                if 'ComicInfo.xml' not in src.namelist():
+                    self.log(f"ComicInfo.xml not found in {comic_path.name}", 'ERROR')
+                    return False, False
+
+                comic_info_path.write_bytes(src.read('ComicInfo.xml'))
+
+                success, modified = self.modify_comic_info(comic_info_path)
+
+                if not success:
+                    return False, False
+
+                if not modified:
+                    self.log(f"No changes needed for {comic_path.name}")
+                    return True, False
+
+                fd, partial_name = tempfile.mkstemp(prefix=f".{comic_path.stem}_", suffix='.partial',
+                                                    dir=comic_path.parent)
+                os.close(fd)
+                partial_path = Path(partial_name)
+
+                files_excluded = 0
+                with zipfile.ZipFile(partial_path, 'w', zipfile.ZIP_DEFLATED) as dst:
+                    for info in src.infolist():
+                        if info.is_dir():
+                            continue
+
+                        if not self.should_keep_file(Path(info.filename)):
+                            files_excluded += 1
+                            self.log(f"Excluding non-comic file: {info.filename}")
+                            continue
+
+                        if info.filename == 'ComicInfo.xml':
+                            dst.write(comic_info_path, info.filename)
+                            continue
+
+                        # Fresh ZipInfo so stale offsets and extra fields aren't carried over
+                        new_info = zipfile.ZipInfo(info.filename, info.date_time)
+                        new_info.compress_type = info.compress_type
+                        new_info.external_attr = info.external_attr
+                        new_info.file_size = info.file_size
+
+                        with src.open(info, 'r') as member_in, dst.open(new_info, 'w') as member_out:
+                            shutil.copyfileobj(member_in, member_out, STREAM_CHUNK_SIZE)
+
+                if self.clean_archive and files_excluded:
+                    self.log(f"Cleaned archive: removed {files_excluded} non-comic file(s)")
+
+            shutil.copymode(comic_path, partial_path)
+            self.copy_ownership(comic_path, partial_path)
+            os.replace(partial_path, comic_path)
+            partial_path = None
+            self.log(f"Successfully updated: {comic_path.name}")
+            return True, True
+        except Exception as e:
+            self.log(f"Failed to rewrite CBZ {comic_path.name}: {e}", 'ERROR')
+            return False, False
+        finally:
+            if partial_path is not None and partial_path.exists():
+                partial_path.unlink()
+
+    def _stream_cbr(self, comic_path: Path, temp_path: Path) -> Tuple[bool, bool]:
+        """Update a copy of a CBR with rar beside the original, then swap it in."""
+        comic_info_path = temp_path / 'ComicInfo.xml'
+        partial_path = None
+
+        try:
+            result = subprocess.run(
+                ['unrar', 'x', '-o+', str(comic_path), 'ComicInfo.xml', str(temp_path)],
+                capture_output=True,
+                text=True,
+                check=False
+            )
+
+            if result.returncode != 0 or not comic_info_path.exists():
+                self.log(f"ComicInfo.xml not found in {comic_path.name}", 'ERROR')
+                return False, False
+
+            success, modified = self.modify_comic_info(comic_info_path)
+
+            if not success:
+                return False, False
+
+            if not modified:
+                self.log(f"No changes needed for {comic_path.name}")
+                return True, False
+
+            # Keep a .cbr extension, otherwise rar appends .rar to the archive name
+            fd, partial_name = tempfile.mkstemp(prefix=f".{comic_path.stem}_", suffix='.partial.cbr',
+                                                dir=comic_path.parent)
+            os.close(fd)
+            partial_path = Path(partial_name)
+            shutil.copy2(comic_path, partial_path)
+
+            if self.clean_archive:
+                members = self.list_members(comic_path) or []
+                excluded = [name for name, _ in members if not self.should_keep_file(Path(name))]
+
+                if excluded:
+                    for name in excluded:
+                        self.log(f"Excluding non-comic file: {name}")
+
+                    result = subprocess.run(
+                        ['rar', 'd', str(partial_path)] + excluded,
+                        capture_output=True,
+                        text=True,
+                        check=False
+                    )
+
+                    if result.returncode != 0:
+                        self.log(f"rar error: {result.stderr}", 'ERROR')
+                        return False, False
+
+                    self.log(f"Cleaned archive: removed {len(excluded)} non-comic file(s)")
+
+            result = subprocess.run(
+                ['rar', 'a', str(partial_path.resolve()), 'ComicInfo.xml'],
+                cwd=temp_path,
+                capture_output=True,
+                text=True,
+                check=False
+            )
+
+            if result.returncode != 0:
+                self.log(f"rar error: {result.stderr}", 'ERROR')
+                return False, False
+
+            self.copy_ownership(comic_path, partial_path)
+            os.replace(partial_path, comic_path)
+            partial_path = None
+            self.log(f"Successfully updated: {comic_path.name}")
+            return True, True
+        except FileNotFoundError:
+            self.log("rar/unrar command not found. Please install rar and unrar.", 'ERROR')
+            return False, False
+        except Exception as e:
+            self.log(f"Failed to update CBR {comic_path.name}: {e}", 'ERROR')
+            return False, False
+        finally:
+            if partial_path is not None and partial_path.exists():
+                partial_path.unlink()
+
     def cleanup(self):
-        """Clean up backup directory."""
+        """Clean up backup directory and page encoding workers."""
+        if self.page_pool is not None:
+            self.page_pool.shutdown()
+            self.page_pool = None
+
         if self.backup_dir and self.backup_dir.exists():
             shutil.rmtree(self.backup_dir)
             self.log(f"Cleaned up backup directory: {self.backup_dir}")
@@ -530,6 +1331,12 @@ Examples:
 
   # View metadata from a single file
   %(prog)s comic.cbz --view
+
+  # Process 4 files at a time within 10 GB of temp space and 2 GB of memory
+  %(prog)s /comics --attribute Publisher="Marvel" --jobs 4 --max-temp 10G --max-memory 2G
+
+  # Convert pages to WEBP and shrink them to at most 2400px (requires Pillow)
+  %(prog)s /comics --optimize-pages --page-format webp --page-quality 80 --page-max-dimension 2400
         """
     )
 
@@ -582,6 +1389,54 @@ Examples:
         help='Keep backup files after processing (default: delete)'
     )
 
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Number of files to process concurrently (default: 1)'
+    )
+
+    parser.add_argument(
+        '--max-temp',
+        type=parse_size,
+        help='Maximum temp space in the temp directory for all files in progress, e.g. 10G '
+             '(default: free space on the temp filesystem)'
+    )
+
+    parser.add_argument(
+        '--max-memory',
+        type=parse_size,
+        help='Maximum estimated memory for all files in progress, e.g. 2G (default: unlimited)'
+    )
+
+    parser.add_argument(
+        '--optimize-pages',
+        action='store_true',
+        help='Re-encode/downscale page images when repackaging, keeping originals that are already smaller '
+             '(requires Pillow)'
+    )
+
+    parser.add_argument(
+        '--page-format',
+        choices=['original'] + sorted(PAGE_FORMATS),
+        default='original',
+        help='Target format for optimized pages (default: original, keep each page\'s format)'
+    )
+
+    parser.add_argument(
+        '--page-quality',
+        type=int,
+        default=85,
+        help='Encoder quality 1-100 for optimized JPEG/WEBP pages (default: 85)'
+    )
+
+    parser.add_argument(
+        '--page-max-dimension',
+        type=int,
+        default=3200,
+        help='Maximum width/height in pixels for optimized pages, 0 for no limit (default: 3200)'
+    )
+
     args = parser.parse_args()
 
     # Handle view mode
@@ -600,14 +1455,31 @@ Examples:
         success = modifier.view_metadata(file_path)
         sys.exit(0 if success else 1)
 
-    # Normal modification mode requires attributes
-    if not args.attribute:
-        print("Error: --attribute is required when not using --view mode", file=sys.stderr)
+    if args.jobs < 1:
+        print("Error: --jobs must be at least 1", file=sys.stderr)
+        sys.exit(1)
+
+    if args.optimize_pages:
+        if Image is None:
+            print("Error: --optimize-pages requires Pillow (pip install Pillow)", file=sys.stderr)
+            sys.exit(1)
+
+        if not 1 <= args.page_quality <= 100:
+            print("Error: --page-quality must be between 1 and 100", file=sys.stderr)
+            sys.exit(1)
+
+        if args.page_max_dimension < 0:
+            print("Error: --page-max-dimension cannot be negative", file=sys.stderr)
+            sys.exit(1)
+
+    # Normal modification mode requires attributes, unless only optimizing pages
+    if not args.attribute and not args.optimize_pages:
+        print("Error: --attribute is required when not using --view or --optimize-pages", file=sys.stderr)
         sys.exit(1)
 
     # Parse attribute arguments
     attributes = []
-    for attr_str in args.attribute:
+    for attr_str in args.attribute or []:
         if '=' not in attr_str:
             print(f"Error: --attribute must be in key=value format: {attr_str}", file=sys.stderr)
             sys.exit(1)
@@ -620,12 +1492,14 @@ Examples:
 
         attributes.append((key, value))
 
-    if not attributes:
+    if not attributes and not args.optimize_pages:
         print("Error: At least one attribute must be specified", file=sys.stderr)
         sys.exit(1)
 
     # Initialize modifier
-    modifier = ComicInfoModifier(attributes, args.verbose, args.update_only, args.clean_archive, not args.no_recursive)
+    modifier = ComicInfoModifier(attributes, args.verbose, args.update_only, args.clean_archive, not args.no_recursive,
+                                 optimize_pages=args.optimize_pages, page_format=args.page_format,
+                                 page_quality=args.page_quality, page_max_dimension=args.page_max_dimension)
 
     try:
         # Get all comic files
@@ -637,6 +1511,32 @@ Examples:
 
         modifier.log(f"Found {len(comic_files)} comic file(s) to process")
 
+        scheduler = ResourceScheduler(Path(tempfile.gettempdir()), args.max_temp, args.max_memory,
+                                      modifier.page_workers)
+
+        def run_scheduled(comic_file: Path) -> Tuple[bool, bool, Optional[str]]:
+            """Wait for the file's resources, then process it on the chosen path."""
+            full, streaming = modifier.estimate_resources(comic_file)
+            reservation = scheduler.acquire(comic_file, full, streaming)
+
+            if reservation is None:
+                modifier.log(f"Not enough space or memory to process {comic_file.name}: "
+                             f"needs {format_size(streaming.temp_bytes)} free beside the archive and "
+                             f"{format_size(streaming.memory_bytes)} of memory even in low-space mode", 'ERROR')
+                return False, False, None
+
+            mode = reservation.mode
+            try:
+                if mode == 'streaming':
+                    modifier.log(f"{comic_file.name} needs {format_size(full.temp_bytes)} of temp space, "
+                                 f"using low-space mode")
+                    success, modified = modifier.process_file_streaming(comic_file)
+                else:
+                    success, modified = modifier.process_file(comic_file)
+                return success, modified, mode
+            finally:
+                scheduler.release(reservation)
+
         # Start timing
         start_time = time.time()
 
@@ -644,9 +1544,14 @@ Examples:
         modified_count = 0
         unchanged_count = 0
         fail_count = 0
+        streaming_count = 0
+
+        with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+            results = list(executor.map(run_scheduled, comic_files))
 
-        for comic_file in comic_files:
-            success, modified = modifier.process_file(comic_file)
+        for success, modified, mode in results:
+            if mode == 'streaming':
+                streaming_count += 1
             if success:
                 if modified:
                     modified_count += 1
@@ -664,9 +1569,18 @@ Examples:
         print(f"  Successfully modified: {modified_count}")
         if args.verbose and unchanged_count > 0:
             print(f"  No changes needed: {unchanged_count}")
+        if streaming_count > 0:
+            print(f"  Processed in low-space mode: {streaming_count}")
         print(f"  Failed: {fail_count}")
         print(f"  Total: {len(comic_files)}")
         print(f"  Elapsed time: {elapsed_time:.2f} seconds")
+        if args.optimize_pages:
+            total_saved = sum(saved for _, saved in modifier.page_savings.values())
+            print(f"  Page optimization saved: {format_size(total_saved)}")
+            for comic_file in comic_files:
+                if comic_file in modifier.page_savings:
+                    pages, saved = modifier.page_savings[comic_file]
+                    print(f"    {comic_file.name}: {format_size(saved)} ({pages} page(s))")
         print(f"{'=' * 60}")
 
         # Cleanup
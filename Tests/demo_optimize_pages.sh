@@ -0,0 +1,97 @@
+#!/bin/bash
+# Demo of --optimize-pages feature (requires Pillow)
+
+echo "====================================="
+echo "Page Optimization Feature Demo"
+echo "====================================="
+
+cd /home/claude
+mkdir -p optimize_test/comic
+
+# Create a comic with an oversized scan and a small page
+python3 - << 'EOF2'
+import os
+from PIL import Image
+
+noise = Image.frombytes('RGB', (800, 1000), os.urandom(800 * 1000 * 3))
+noise.resize((4000, 5000)).save('optimize_test/comic/page01.png')
+Image.new('RGB', (1000, 1500), 'blue').save('optimize_test/comic/page02.jpg', quality=70)
+
+sizes = {name: os.path.getsize(f'optimize_test/comic/{name}') for name in ('page01.png', 'page02.jpg')}
+with open('optimize_test/comic/ComicInfo.xml', 'w') as f:
+    f.write(f'''<?xml version="1.0" encoding="utf-8"?>
+<ComicInfo>
+  <Title>Test Comic</Title>
+  <Pages>
+    <Page Image="0" ImageSize="{sizes['page01.png']}" ImageWidth="4000" ImageHeight="5000" Type="FrontCover" />
+    <Page Image="1" ImageSize="{sizes['page02.jpg']}" ImageWidth="1000" ImageHeight="1500" />
+  </Pages>
+</ComicInfo>
+''')
+EOF2
+
+cd optimize_test/comic && zip -q ../comic.cbz * && cd ../..
+
+echo
+echo "BEFORE: Contents of archive"
+echo "========================================"
+unzip -l optimize_test/comic.cbz
+echo
+
+echo "====================================="
+echo "TEST 1: Downscale oversized pages (keep formats)"
+echo "====================================="
+echo
+
+cp optimize_test/comic.cbz optimize_test/test_downscale.cbz
+
+./comic_info_modifier.py optimize_test/test_downscale.cbz \
+    --optimize-pages \
+    --page-max-dimension 2000 \
+    -v
+
+echo
+echo "AFTER: page01.png downscaled, page02.jpg skipped (already within limits)"
+unzip -l optimize_test/test_downscale.cbz
+echo
+echo "Updated <Pages> metadata:"
+unzip -p optimize_test/test_downscale.cbz ComicInfo.xml
+echo
+echo
+
+echo "====================================="
+echo "TEST 2: Convert pages to WEBP"
+echo "====================================="
+echo
+
+cp optimize_test/comic.cbz optimize_test/test_webp.cbz
+
+./comic_info_modifier.py optimize_test/test_webp.cbz \
+    --attribute Publisher="Test Publisher" \
+    --optimize-pages \
+    --page-format webp \
+    --page-quality 80
+
+echo
+echo "AFTER: Pages converted to WEBP"
+unzip -l optimize_test/test_webp.cbz
+echo
+
+echo "====================================="
+echo "TEST 3: Already optimized archive"
+echo "====================================="
+echo "Nothing is re-encoded, so the archive is left unchanged"
+echo
+
+./comic_info_modifier.py optimize_test/test_webp.cbz \
+    --optimize-pages \
+    --page-format webp \
+    -v
+
+echo
+
+rm -rf optimize_test
+
+echo "====================================="
+echo "Page optimization test complete!"
+echo "====================================="
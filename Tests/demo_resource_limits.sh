@@ -0,0 +1,83 @@
+#!/bin/bash
+# Demo of resource-aware scheduling (--jobs, --max-temp, --max-memory) and low-space mode
+
+echo "====================================="
+echo "Resource Limits Feature Demo"
+echo "====================================="
+
+cd /home/claude
+mkdir -p resource_demo
+
+# Create 4 test comics (~5MB each)
+echo "Creating 4 test comics..."
+for i in {1..4}; do
+    mkdir -p resource_demo/comic$i
+    cat > resource_demo/comic$i/ComicInfo.xml << EOF2
+<?xml version="1.0" encoding="utf-8"?>
+<ComicInfo>
+  <Title>Test Comic $i</Title>
+  <Series>Test Series</Series>
+</ComicInfo>
+EOF2
+    head -c 3000000 /dev/urandom > resource_demo/comic$i/page01.jpg
+    head -c 2000000 /dev/urandom > resource_demo/comic$i/page02.png
+    echo "NFO info data" > resource_demo/comic$i/info.nfo
+
+    cd resource_demo/comic$i && zip -q ../comic$i.cbz * && cd ../..
+    rm -rf resource_demo/comic$i
+done
+echo
+
+echo "====================================="
+echo "TEST 1: Concurrent processing (no limits)"
+echo "====================================="
+echo
+
+./comic_info_modifier.py resource_demo --attribute Publisher="Test Publisher" --jobs 4
+
+echo
+echo "====================================="
+echo "TEST 2: Memory budget limits concurrency"
+echo "====================================="
+echo "Each CBZ is estimated at ~32MB, so 70M lets two run at once"
+echo
+
+./comic_info_modifier.py resource_demo --attribute Publisher="Memory Test" --jobs 4 --max-memory 70M -v
+
+echo
+echo "====================================="
+echo "TEST 3: Small temp budget forces low-space mode"
+echo "====================================="
+echo "Normal mode needs ~15MB per comic, low-space mode ~5MB"
+echo
+
+./comic_info_modifier.py resource_demo --attribute Publisher="Low Space" --max-temp 8M --clean-archive -v
+
+echo
+echo "Metadata after low-space mode:"
+unzip -p resource_demo/comic1.cbz ComicInfo.xml
+echo
+echo
+echo "Files after low-space mode (info.nfo removed):"
+unzip -l resource_demo/comic1.cbz | tail -n +4 | head -n -2 | awk '{print "  - " $4}'
+echo
+
+echo "====================================="
+echo "TEST 4: Memory budget too small for any mode"
+echo "====================================="
+echo "Files are reported as failed and left untouched"
+echo
+
+./comic_info_modifier.py resource_demo --attribute Publisher="Too Small" --max-temp 1M --max-memory 1M
+
+echo
+echo "Metadata is unchanged:"
+unzip -p resource_demo/comic1.cbz ComicInfo.xml
+echo
+echo
+
+rm -rf resource_demo
+
+echo "====================================="
+echo "Resource limits demo complete!"
+echo "====================================="